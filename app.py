@@ -1,51 +1,339 @@
 import os
+import re
 import datetime
+import functools
+import json
+from urllib.parse import urlencode
+import orjson
 import pymongo
+from pymongo import IndexModel, WriteConcern
+from pymongo.errors import DuplicateKeyError, ExecutionTimeout, OperationFailure
 from bson.objectid import ObjectId
-from dotenv import load_dotenv, dotenv_values
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from dotenv import dotenv_values
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, jsonify
+from flask_caching import Cache
+from flask_compress import Compress
 
-# load environment variables from .env file
-load_dotenv()
+# .env is parsed once and applied to os.environ without overriding real environment
+# variables (what load_dotenv() does); production sets real variables and skips the file.
+if os.getenv("FLASK_ENV") != "production":
+    for _key, _value in dotenv_values().items():
+        if _value is not None:
+            os.environ.setdefault(_key, _value)
 
-def create_app():
+# longest user search term sent to MongoDB (category prefix regex or $text words);
+# bounds pattern compile/match cost
+MAX_SEARCH_LEN = 64
+
+# format of the <input type="date"> values the expense forms submit
+DATE_FMT = "%Y-%m-%d"
+
+# Flask config read from the environment in create_app(): these keys as plain strings, plus
+# every key with one of the extension prefixes (Flask-Caching, Flask-Compress)
+ENV_CONFIG_KEYS = ("SECRET_KEY", "PAGINATION_STRATEGY")
+ENV_CONFIG_PREFIXES = ("CACHE_", "COMPRESS_")
+
+
+def _env_config():
+    """
+    Config mapping from os.environ. Prefixed values are decoded as JSON when they parse
+    (like Flask's from_prefixed_env), so CACHE_DEFAULT_TIMEOUT=300 or COMPRESS_MIN_SIZE=500
+    arrive as ints and COMPRESS_REGISTER=false as a bool; anything else stays a string.
+    """
+    config = {k: os.environ[k] for k in ENV_CONFIG_KEYS if k in os.environ}
+    for key, value in os.environ.items():
+        if key.startswith(ENV_CONFIG_PREFIXES):
+            try:
+                config[key] = json.loads(value)
+            except ValueError:
+                config[key] = value
+    return config
+
+# one client per process: MongoClient is thread-safe and owns the connection pool,
+# so every app instance shares it instead of re-handshaking on each create_app() call.
+# No startup ping: the driver monitors the servers in the background, and `flask init-db`
+# does the one-off connectivity check during deployment.
+# The pool is sized to the expected request concurrency (workers x threads, MONGO_MAX_POOL);
+# explicit timeouts bound how long a request can stall on a slow or unreachable server.
+# Wire compression is negotiated in order; zstd and snappy come from the zstandard and
+# python-snappy packages in requirements.txt, zlib is always available.
+cxn = pymongo.MongoClient(
+    os.getenv("MONGO_URI"),
+    maxPoolSize=int(os.getenv("MONGO_MAX_POOL", "20")),
+    minPoolSize=2,
+    maxIdleTimeMS=300_000,
+    serverSelectionTimeoutMS=3000,
+    connectTimeoutMS=3000,
+    socketTimeoutMS=10000,
+    appname="bytesized",
+    retryWrites=True,
+    compressors="zstd,snappy,zlib",
+)
+
+# summary endpoints and finder JSON bodies are cached for a short TTL. The default
+# SimpleCache is per-process: invalidation after a write only reaches the worker that
+# served it, so run CACHE_TYPE=RedisCache (+ CACHE_REDIS_URL) with more than one worker.
+cache = Cache()
+SUMMARY_CACHE_TIMEOUT = 60
+# finder / list JSON bodies are cached for less: they are invalidated by generation, and a
+# missed bump (e.g. a write from another process) should not keep serving stale rows for long
+JSON_CACHE_TIMEOUT = 30
+compress = Compress()
+
+# server-side time limit for list/aggregate reads so a pathological query can't pin a
+# worker (and a pooled connection) until the HTTP timeout
+QUERY_MAX_TIME_MS = 2000
+
+# server error code for a query that needs a missing index (e.g. $text without a text index)
+INDEX_NOT_FOUND = 27
+
+# timezone-aware "now" for created_at/modified_at (utcnow() is deprecated since 3.12);
+# the UTC tzinfo is bound once so write paths skip the attribute lookups per call
+_UTC = datetime.timezone.utc
+
+
+def _utcnow():
+    return datetime.datetime.now(_UTC)
+
+# fields the plan/budget listings actually use; passed as projections so unused
+# fields are never sent over the wire or decoded
+PLAN_LIST_PROJ = {
+    "title": 1, "actual_expense": 1, "day": 1, "month": 1, "year": 1,
+    "category": 1, "notes": 1, "created_at": 1,
+}
+EXPENSE_LIST_PROJ = {"date": 1, "year": 1, "month": 1, "amount": 1, "category": 1, "note": 1}
+BUDGET_LIST_PROJ = {"budget": 1, "month": 1, "year": 1, "notes": 1, "created_at": 1, "modified_at": 1}
+
+# shared $group stage for a month's planned total, built once instead of per request.
+# Plain dicts keep key order (3.7+) and are encoded natively, so SON isn't needed.
+# Expense totals are materialized in monthly_summary (see rebuild_summaries), so that
+# side only needs the stored spent field.
+PLANS_SPENT_GROUP = {"$group": {"_id": None, "spent": {"$sum": "$actual_expense"}}}
+SUMMARY_SPENT_PROJECT = {"$project": {"_id": 0, "spent": 1}}
+
+
+def init_db(db):
+    """
+    Ping the server and create the indexes the routes rely on.
+    Creating an existing index is a no-op, so re-running this is safe.
+    Args:
+        db (Database): the database to initialise.
+    """
+    db.command("ping")
+    print(" *", "Connected to MongoDB!")
+
+    # one budget per month: drop legacy duplicates, then let a unique index enforce it
+    _run_migration(db, "unique_monthly_budgets", unique_monthly_budgets)
+
+    # Compound keys follow the query shapes: equality fields first (prefixes such as
+    # year only or year+month reuse them), then the sort key so results come back in
+    # index order. background=True keeps a build on a live collection from blocking it
+    # (servers >= 4.2 ignore it and always build without a collection lock).
+    # create_indexes sends one createIndexes command per collection.
+    db.plans.create_indexes([
+        IndexModel([("created_at", -1)], background=True),
+        IndexModel([("year", 1), ("month", 1), ("day", 1), ("created_at", -1)], background=True),
+        IndexModel([("category_lc", 1), ("created_at", -1)], background=True),
+        # covers the spent-total lookup (match year+month, $sum actual_expense) from the index alone
+        IndexModel([("year", 1), ("month", 1), ("actual_expense", 1)], background=True),
+    ])
+    db.expenses.create_indexes([
+        IndexModel([("year", 1), ("month", 1), ("date", -1)], background=True),
+        # keyset pagination for expenses_list, unfiltered and by category
+        IndexModel([("date", -1), ("_id", -1)], background=True),
+        IndexModel([("category_lc", 1), ("date", -1), ("_id", -1)], background=True),
+        # word search over note/title for expenses_list's q
+        IndexModel([("note", "text"), ("title", "text")], background=True),
+    ])
+    db.monthly_budgets.create_indexes([
+        IndexModel([("year", 1), ("month", 1)], unique=True, background=True),
+    ])
+    # materialized expense totals: one doc per month and per month+category
+    db.monthly_summary.create_indexes([
+        IndexModel([("year", 1), ("month", 1)], unique=True, background=True),
+    ])
+    db.monthly_category_summary.create_indexes([
+        IndexModel([("year", 1), ("month", 1), ("category", 1)], unique=True, background=True),
+    ])
+    print(" *", "MongoDB indexes are in place")
+
+    # add the lowercased category copy to documents written before it was stored
+    _run_migration(db, "backfill_category_lc", backfill_category_lc)
+
+    # seed the materialized summaries once per database: afterwards the write routes
+    # maintain them, and a rebuild here would race live writes on every deploy
+    _run_migration(db, "seed_monthly_summaries", rebuild_summaries)
+
+
+def _run_migration(db, name, fn):
+    """
+    Run fn(db) once per database. A marker doc in `migrations` records that it completed,
+    so later init-db runs skip it regardless of what the app has written in the meantime
+    (e.g. summary docs upserted by expenses saved before init-db first ran).
+    Args:
+        db (Database): the database to migrate.
+        name (str): unique migration name, used as the marker's _id.
+        fn (callable): the migration, called with db.
+    """
+    if db.migrations.find_one({"_id": name}, {"_id": 1}) is not None:
+        return
+    fn(db)
+    db.migrations.update_one({"_id": name}, {"$set": {"applied_at": _utcnow()}}, upsert=True)
+    print(" *", f"Migration {name} applied")
+
+
+def backfill_category_lc(db):
+    """
+    Set category_lc (the lowercased category the filters and indexes use) on plans and
+    expenses that predate it. `category` itself keeps the user's capitalisation; docs
+    whose category is missing or not a string are left alone.
+    Args:
+        db (Database): the database to migrate.
+    """
+    for collection in (db.plans, db.expenses):
+        collection.update_many(
+            {"category_lc": {"$exists": False}, "category": {"$type": "string"}},
+            [{"$set": {"category_lc": {"$toLower": "$category"}}}],
+        )
+
+
+def unique_monthly_budgets(db):
+    """
+    Keep only the newest budget (by created_at, the one every read path shows) for each
+    month/year, then create the unique (year, month) index so duplicates cannot come back.
+    Args:
+        db (Database): the database to migrate.
+    """
+    stale = []
+    for group in db.monthly_budgets.aggregate([
+        {"$sort": {"created_at": -1}},
+        {"$group": {"_id": {"year": "$year", "month": "$month"}, "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ]):
+        stale.extend(group["ids"][1:])
+    if stale:
+        db.monthly_budgets.delete_many({"_id": {"$in": stale}})
+        print(" *", f"Removed {len(stale)} duplicate monthly budgets")
+    db.monthly_budgets.create_index([("year", 1), ("month", 1)], unique=True, background=True)
+
+
+def rebuild_summaries(db):
+    """
+    Recompute monthly_summary and monthly_category_summary from the expenses collection.
+    The write routes keep them current with $inc, so this is only needed to seed them
+    or to resync after drift (an expense written but its $inc lost, or expenses changed
+    outside the app): `flask rebuild-summaries`.
+    Must not run alongside live writes: $out replaces each collection wholesale, so an
+    $inc that lands while the aggregation runs is silently overwritten.
+    Args:
+        db (Database): the database to rebuild the summaries in.
+    """
+    db.expenses.aggregate([
+        {"$group": {
+            "_id": {"year": "$year", "month": "$month"},
+            "spent": {"$sum": "$amount"},
+            "count": {"$sum": 1},
+        }},
+        {"$project": {"_id": 0, "year": "$_id.year", "month": "$_id.month", "spent": 1, "count": 1}},
+        {"$out": "monthly_summary"},
+    ])
+    db.expenses.aggregate([
+        {"$group": {
+            "_id": {
+                "year": "$year", "month": "$month",
+                "category": {"$ifNull": ["$category_lc", {"$toLower": "$category"}]},
+            },
+            "spent": {"$sum": "$amount"},
+            "count": {"$sum": 1},
+        }},
+        {"$project": {
+            "_id": 0, "year": "$_id.year", "month": "$_id.month", "category": "$_id.category",
+            "spent": 1, "count": 1,
+        }},
+        {"$out": "monthly_category_summary"},
+    ])
+    print(" *", "Monthly summaries rebuilt")
+
+
+def create_app(db=None):
     """
     Create and configure the Flask application.
+    Args:
+        db (Database, optional): the database to use; defaults to MONGO_DBNAME on the shared client.
     returns: app: the Flask application object
     """
 
     app = Flask(__name__)
-    # load flask config from env variables
-    config = dotenv_values()
-    app.config.from_mapping(config)
-    
+    # load flask config from env variables (already including .env)
+    app.config.from_mapping(_env_config())
+
     # Ensure SECRET_KEY is set (required for sessions and flash messages)
     if not app.config.get('SECRET_KEY'):
-        app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
-
-    cxn = pymongo.MongoClient(os.getenv("MONGO_URI"))
-    db = cxn[os.getenv("MONGO_DBNAME")]
-
+        app.config['SECRET_KEY'] = 'dev-secret-key-change-in-production'
+
+    app.config.setdefault('CACHE_TYPE', 'SimpleCache')
+    cache.init_app(app)
+
+    # compress JSON/HTML responses (the finder arrays repeat every field name, so they
+    # shrink several times over). Every view returns a complete body, so Flask-Compress
+    # compresses it once in after_request.
+    app.config.setdefault('COMPRESS_ALGORITHM', ['br', 'gzip'])
+    app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+    compress.init_app(app)
+
+    if db is None:
+        db = cxn[os.getenv("MONGO_DBNAME")]
+
+    # Plan and expense writes only need the primary's ack (no journal / replica wait): the
+    # redirect that follows reads from the primary, so the new doc is already visible there.
+    # Budgets are money, so they always wait for a majority regardless of the URI default.
+    fast_wc = WriteConcern(w=1, j=False)
+    plans_fast = db.plans.with_options(write_concern=fast_wc)
+    expenses_fast = db.expenses.with_options(write_concern=fast_wc)
+    budgets_durable = db.monthly_budgets.with_options(write_concern=WriteConcern(w="majority"))
+
+    @app.cli.command("init-db")
+    def init_db_command():
+        """
+        Check the MongoDB connection and create the indexes. Run once per deploy: `flask init-db`.
+        """
+        init_db(db)
 
-    try:
-        cxn.admin.command("ping")
-        print(" *", "Connected to MongoDB!")
-    except Exception as e:
-        print(" * MongoDB connection error:", e)
+    @app.cli.command("rebuild-summaries")
+    def rebuild_summaries_command():
+        """
+        Recompute the materialized monthly summaries from expenses. Stop the web workers
+        first: writes during the rebuild are lost from the summaries.
+        """
+        rebuild_summaries(db)
 
+    @app.errorhandler(ExecutionTimeout)
+    def query_timeout(e):
+        """
+        A read exceeded QUERY_MAX_TIME_MS: answer 504 instead of holding the worker.
+        """
+        return "The database took too long to respond. Please try again.", 504
 
     # -----------------------
     # Helper utilities
     # -----------------------
+    # cheap up-front checks instead of raising and catching on every bad id/int input
     def _safe_objectid(oid):
-        try:
-            return ObjectId(oid)
-        except Exception:
-            return None
+        return ObjectId(oid) if oid and ObjectId.is_valid(oid) else None
 
     def _parse_int_or_none(s):
+        # same inputs int() takes: surrounding whitespace and at most one sign, then digits
+        # (isdecimal() accepts exactly the digits int() does; isdigit() also allows e.g. "²")
+        if not s:
+            return None
+        t = s.strip()
+        digits = t[1:] if t[:1] in ("+", "-") else t
+        return int(t) if digits.isdecimal() else None
+
+    def _parse_datetime_or_none(s):
+        # no cheap pre-check for ISO format, so this one still relies on the exception
         try:
-            return int(s)
+            return datetime.datetime.fromisoformat(s)
         except Exception:
             return None
 
@@ -57,6 +345,157 @@ def create_app():
             return v
         except Exception:
             return None
+
+    def _plan_doc_from_form(form):
+        """
+        Build the editable fields of a plan document from a submitted plan form.
+        Shared by create_plan and edit_plan; the category is kept as typed, with a
+        lowercased category_lc copy for filtering.
+        """
+        actual_expense_str = form.get("actual_expense", "").strip()
+        category = form.get("category", "").strip()
+        day = form.get("day")
+        month = form.get("month")
+        year = form.get("year")
+        return {
+            "title": form["title"],
+            "actual_expense": float(actual_expense_str) if actual_expense_str else 0.0,
+            "day": int(day) if day else None,
+            "month": int(month) if month else None,
+            "year": int(year) if year else None,
+            "category": category,
+            "category_lc": category.lower(),
+            "notes": form.get("notes", ""),
+        }
+
+    def _expense_doc_from_form(form):
+        """
+        Build an expense document from a submitted expense form.
+        Shared by expense_create and expense_edit; year/month are denormalized from the date.
+        """
+        date_obj = datetime.datetime.strptime(form.get("date"), DATE_FMT)
+        category = form.get("category", "").strip()
+        return {
+            "date": date_obj,
+            "year": date_obj.year,
+            "month": date_obj.month,
+            "amount": float(form.get("amount")),
+            "category": category,
+            "category_lc": category.lower(),
+            "note": form.get("note", "").strip(),
+            "title": category or "Expense",
+        }
+
+    def _category_prefix(category):
+        """
+        Anchored, escaped prefix pattern for a category filter. Escaping keeps user input
+        literal (no wildcards or backtracking), and against the lowercased category_lc
+        field of plans and expenses a case-sensitive ^prefix is answered from the index.
+        """
+        return {"$regex": "^" + re.escape(category.strip().lower()[:MAX_SEARCH_LEN])}
+
+    def _page_args(default_size=50, max_size=100):
+        """
+        Read ?page=N&size=M from the query string.
+        Returns (page, size) with page >= 1 and size clamped to 1..max_size.
+        """
+        page = _parse_int_or_none(request.args.get("page")) or 1
+        size = _parse_int_or_none(request.args.get("size")) or default_size
+        return max(page, 1), min(max(size, 1), max_size)
+
+    def _spent_lookup(collection, spent_group, month, year):
+        """
+        $lookup stage that runs `spent_group` (any stage yielding a `spent` field) over
+        `collection` for month/year into `agg`.
+        The sub-pipeline is uncorrelated (plain $match), so it can use the year/month indexes.
+        """
+        return {"$lookup": {
+            "from": collection,
+            "pipeline": [
+                {"$match": {"month": month, "year": year}},
+                spent_group,
+            ],
+            "as": "agg",
+        }}
+
+    def _apply_expense_delta(doc, sign):
+        """
+        Add (sign=1) or remove (sign=-1) one expense doc's amount in the materialized
+        monthly_summary / monthly_category_summary docs. Upserts, so the first expense
+        of a month or category creates its summary doc. Legacy docs without category_lc
+        fall back to the lowercased category, as the init-db backfill sets it.
+        These updates are not atomic with the expense write itself. A multi-document
+        transaction would make them so on a replica set (the Atlas default), but would add a
+        commit round trip to every expense write and fail outright against the standalone
+        mongod in docker-compose; a crash between the writes leaves the summaries off by
+        one expense, and `flask rebuild-summaries` resyncs them.
+        """
+        inc = {"$inc": {"spent": sign * doc["amount"], "count": sign}}
+        key = {"year": doc["year"], "month": doc["month"]}
+        category = doc.get("category_lc", (doc.get("category") or "").lower())
+        db.monthly_summary.update_one(key, inc, upsert=True)
+        db.monthly_category_summary.update_one(dict(key, category=category), inc, upsert=True)
+
+    def _cached_json(collection):
+        """
+        Cache a JSON view's 200 body for JSON_CACHE_TIMEOUT, keyed by path and sorted query
+        args plus the current write generation of `collection`. A hit returns the stored
+        bytes without touching MongoDB or re-encoding anything. Views must return a
+        complete (non-streamed) body, since it is stored whole.
+        The generation lives in the cache too, so with the per-process SimpleCache a write
+        only invalidates the worker that handled it; multi-worker deploys need RedisCache.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                gen = cache.get(f"gen:{collection}") or ""
+                args_qs = urlencode(sorted(request.args.items(multi=True)))
+                key = f"json:{collection}:{gen}:{request.path}?{args_qs}"
+                body = cache.get(key)
+                if body is not None:
+                    return Response(body, mimetype="application/json")
+                resp = app.make_response(view(*args, **kwargs))
+                if resp.status_code == 200:
+                    cache.set(key, resp.get_data(), timeout=JSON_CACHE_TIMEOUT)
+                return resp
+            return wrapper
+        return decorator
+
+    def _invalidate_json(collection):
+        """
+        Start a new write generation for `collection`: every cached JSON body keyed on the
+        old one stops matching at once (no key scan), and expires on its own.
+        """
+        cache.set(f"gen:{collection}", str(ObjectId()), timeout=0)
+
+    def _invalidate_summaries(month=None, year=None):
+        """
+        Drop cached budget summaries for month/year after a write.
+        When either is unknown (e.g. the old month of an edited doc), drop every month.
+        """
+        for f in (_monthly_budget_data, _budget_summary_data, _category_breakdown_data):
+            if month is None or year is None:
+                cache.delete_memoized(f)
+            else:
+                cache.delete_memoized(f, month, year)
+
+    def _jsonify_docs(cursor, batch_size=1000):
+        """
+        Read a cursor in large batches and return it as a JSON array response.
+        A large batch finishes unbounded finder results in one or two round trips instead
+        of one per 101 docs (the driver's default first batch); paged callers pass their
+        page size. The body is built in one encode of the whole list rather than streamed:
+        every caller sits behind _cached_json, which stores the complete body, so streaming
+        would only be buffered again. Reading the cursor here also keeps a mid-cursor
+        ExecutionTimeout inside the view, where the 504 handler sees it.
+        """
+        docs = list(cursor.batch_size(batch_size).max_time_ms(QUERY_MAX_TIME_MS))
+        # orjson encodes dicts, strings, numbers and datetimes natively in C; ObjectId is not
+        # a type it knows, so default=str is a Python callback run once per ObjectId (the
+        # _id of each doc). That is the one per-document Python step left; $toString in an
+        # aggregation would remove it at the cost of turning the plain find()s into pipelines.
+        body = orjson.dumps(docs, default=str, option=orjson.OPT_NAIVE_UTC)
+        return Response(body, mimetype="application/json")
         
     # -----------------------
     # HOME
@@ -68,8 +507,12 @@ def create_app():
         Returns:
             rendered template (str): The rendered HTML template.
         """
-        plans = db.plans.find({}).sort("created_at", -1)
-        return render_template("index.html", plans=plans)
+        page, size = _page_args()
+        plans = db.plans.find({}, PLAN_LIST_PROJ).sort("created_at", -1)\
+            .skip((page - 1) * size)\
+            .limit(size)\
+            .max_time_ms(QUERY_MAX_TIME_MS)
+        return render_template("index.html", plans=plans, page=page, size=size)
 
     # -----------------------
     # PLAN
@@ -82,28 +525,11 @@ def create_app():
         Returns:
             redirect (Response): A redirect response to the home page.
         """
-        title = request.form["title"]  
-         
-        actual_expense_str = request.form.get("actual_expense", "").strip()
-        actual_expense = float(actual_expense_str) if actual_expense_str else 0.0
-
-        day = request.form.get("day")
-        month = request.form.get("month")
-        year = request.form.get("year")
-        category = request.form.get("category", "")
-        notes = request.form.get("notes", "")
-
-        doc = {
-            "title": title,  
-            "actual_expense": actual_expense,
-            "day": int(day) if day else None,  
-            "month": int(month) if month else None,
-            "year": int(year) if year else None,
-            "category": category,
-            "notes": notes,
-            "created_at": datetime.datetime.utcnow(),
-        }
-        db.plans.insert_one(doc)
+        doc = _plan_doc_from_form(request.form)
+        doc["created_at"] = _utcnow()
+        plans_fast.insert_one(doc)
+        _invalidate_summaries(doc["month"], doc["year"])
+        _invalidate_json("plans")
 
         return redirect(url_for("home"))
 
@@ -117,7 +543,11 @@ def create_app():
         Returns:
             rendered template (str): The rendered HTML template.
         """
-        doc = db.plans.find_one({"_id": ObjectId(plan_id)})
+        oid = _safe_objectid(plan_id)
+        if not oid:
+            flash("Invalid plan id", "danger")
+            return redirect(url_for("home"))
+        doc = db.plans.find_one({"_id": oid})
         return render_template("edit_plan.html", doc=doc)
 
     @app.route("/edit/<plan_id>", methods=["POST"])
@@ -130,29 +560,28 @@ def create_app():
         Returns:
             redirect (Response): A redirect response to the home page.
         """
-        title = request.form["title"]
+        oid = _safe_objectid(plan_id)
+        if not oid:
+            flash("Invalid plan id", "danger")
+            return redirect(url_for("home"))
 
-        actual_expense_str = request.form.get("actual_expense", "").strip()
-        actual_expense = float(actual_expense_str) if actual_expense_str else 0.0
+        existing = db.plans.find_one({"_id": oid})
+        if not existing:
+            flash("Plan not found", "danger")
+            return redirect(url_for("home"))
 
-        day = request.form.get("day")
-        month = request.form.get("month")
-        year = request.form.get("year")
-        category = request.form.get("category", "")
-        notes = request.form.get("notes", "")
+        doc = _plan_doc_from_form(request.form)
 
-        doc = {
-            "title": title,
-            "actual_expense": actual_expense,
-            "day": int(day) if day else None,
-            "month": int(month) if month else None,
-            "year": int(year) if year else None,
-            "category": category,
-            "notes": notes,
-            "created_at": datetime.datetime.utcnow(),
-        }
+        # only $set fields that actually changed; skip the write entirely when nothing did
+        update = {k: v for k, v in doc.items() if existing.get(k) != v}
+        if not update:
+            flash("No changes to save", "info")
+            return redirect(url_for("home"))
 
-        db.plans.update_one({"_id": ObjectId(plan_id)}, {"$set": doc})
+        plans_fast.update_one({"_id": oid}, {"$set": update, "$currentDate": {"modified_at": True}})
+        _invalidate_summaries(existing.get("month"), existing.get("year"))
+        _invalidate_summaries(doc["month"], doc["year"])
+        _invalidate_json("plans")
 
         return redirect(url_for("home"))
 
@@ -166,7 +595,13 @@ def create_app():
         Returns:
             redirect (Response): A redirect response to the home page.
         """
-        db.plans.delete_one({"_id": ObjectId(plan_id)})
+        oid = _safe_objectid(plan_id)
+        if not oid:
+            flash("Invalid plan id", "danger")
+            return redirect(url_for("home"))
+        db.plans.delete_one({"_id": oid})
+        _invalidate_summaries()
+        _invalidate_json("plans")
         return redirect(url_for("home"))
 
     @app.route("/search")
@@ -178,18 +613,23 @@ def create_app():
             rendered template (str): The rendered HTML template.
         """
         category = request.args.get("category", "")
+        page, size = _page_args()
         if category:
-            plans = db.plans.find({"category": {"$regex": category, "$options": "i"}}).sort("created_at", -1)
+            plans = db.plans.find({"category_lc": _category_prefix(category)}, PLAN_LIST_PROJ).sort("created_at", -1)
         else:
-            plans = db.plans.find({}).sort("created_at", -1)
-        
-        return render_template("index.html", plans=plans, search_category=category)
+            plans = db.plans.find({}, PLAN_LIST_PROJ).sort("created_at", -1)
+        plans = plans.skip((page - 1) * size).limit(size).max_time_ms(QUERY_MAX_TIME_MS)
+
+        return render_template("index.html", plans=plans, search_category=category, page=page, size=size)
     
 
     @app.route("/expenses_list")
     def expenses_list():
         """
-        List expenses with optional filters: search (q), category, year+month (ym), and pagination (page).
+        List expenses with optional filters: search (q), category, year+month (ym).
+        Pagination is keyset-based on (date, _id): after_date/after_id fetch the page after a
+        row, before_date/before_id the page before it, so no page costs a skip over earlier rows.
+        `page` is only the page number shown to the user.
         """
         q = request.args.get("q", "").strip()
         category = request.args.get("category", "").strip()
@@ -197,21 +637,23 @@ def create_app():
         date_str = request.args.get("date", "").strip()
         year_q = request.args.get("year", "").strip()
         month_q = request.args.get("month", "").strip()
-        page = _parse_int_or_none(request.args.get("page")) or 1
+        page = max(_parse_int_or_none(request.args.get("page")) or 1, 1)
         per_page = 10  # Customize how many expenses per page
+        after_date = _parse_datetime_or_none(request.args.get("after_date", ""))
+        after_id = _safe_objectid(request.args.get("after_id", ""))
+        before_date = _parse_datetime_or_none(request.args.get("before_date", ""))
+        before_id = _safe_objectid(request.args.get("before_id", ""))
 
         query = {}
 
-        # Handle search by note/title
+        # Handle search by note/title: word lookup in the text index instead of a
+        # case-insensitive regex over every document (words match whole and stemmed)
         if q:
-            query["$or"] = [
-                {"note": {"$regex": q, "$options": "i"}},
-                {"title": {"$regex": q, "$options": "i"}}
-            ]
+            query["$text"] = {"$search": q[:MAX_SEARCH_LEN]}
 
-        # Handle category filter
+        # Handle category filter (prefix match on the lowercased copy, which is indexed)
         if category:
-            query["category"] = {"$regex": category, "$options": "i"}
+            query["category_lc"] = _category_prefix(category)
 
         # Handle exact date filter (YYYY-MM-DD)
         if date_str:
@@ -245,19 +687,89 @@ def create_app():
             except ValueError:
                 flash("Invalid date format for ym. Use YYYY-MM.", "warning")
 
-        # Get total count
-        total_expenses = db.expenses.count_documents(query)
-        total_pages = (total_expenses + per_page - 1) // per_page
+        # Fetch one page by keyset (newest first); one extra doc tells us whether more exist
+        backward = before_date is not None and before_id is not None
+        forward = not backward and after_date is not None and after_id is not None
+        if backward:
+            # walk up from the first row of the current page, then flip back to newest first
+            keyset = {"$or": [
+                {"date": {"$gt": before_date}},
+                {"date": before_date, "_id": {"$gt": before_id}},
+            ]}
+            sort = [("date", 1), ("_id", 1)]
+        elif forward:
+            keyset = {"$or": [
+                {"date": {"$lt": after_date}},
+                {"date": after_date, "_id": {"$lt": after_id}},
+            ]}
+            sort = [("date", -1), ("_id", -1)]
+        else:
+            keyset = None
+            sort = [("date", -1), ("_id", -1)]
+
+        # Total page count only when the configured strategy allows it:
+        #   none      - never count (cost stays O(per_page))
+        #   estimated - collection metadata count, only for the unfiltered list
+        #   full      - count over the filter (O(matches)), fused with the page fetch below
+        strategy = app.config.get("PAGINATION_STRATEGY", "none")
+
+        def fetch_page(query):
+            """
+            One page (per_page + 1 rows) for `query`, plus the total when the strategy counts.
+            """
+            if strategy == "full":
+                # one round trip: the filter runs once and $facet branches it into page + count
+                rows = [{"$sort": dict(sort)}, {"$limit": per_page + 1}, {"$project": EXPENSE_LIST_PROJ}]
+                if keyset:
+                    rows.insert(0, {"$match": keyset})
+                result = next(db.expenses.aggregate([
+                    {"$match": query},
+                    {"$facet": {"rows": rows, "total": [{"$count": "n"}]}},
+                ], maxTimeMS=QUERY_MAX_TIME_MS))
+                return result["rows"], result["total"][0]["n"] if result["total"] else 0
+            page_query = {"$and": [query, keyset]} if keyset else query
+            rows = list(db.expenses.find(page_query, EXPENSE_LIST_PROJ)
+                .sort(sort)
+                .limit(per_page + 1)
+                .max_time_ms(QUERY_MAX_TIME_MS))
+            if strategy == "estimated" and not query:
+                return rows, db.expenses.estimated_document_count()
+            return rows, None
+
+        try:
+            expenses, total_expenses = fetch_page(query)
+        except OperationFailure as e:
+            # $text needs the text index `flask init-db` creates; without it (IndexNotFound)
+            # fall back to the escaped case-insensitive regex instead of failing the page
+            if e.code != INDEX_NOT_FOUND or "$text" not in query:
+                raise
+            del query["$text"]
+            q_pattern = re.escape(q[:MAX_SEARCH_LEN])
+            query["$or"] = [
+                {"note": {"$regex": q_pattern, "$options": "i"}},
+                {"title": {"$regex": q_pattern, "$options": "i"}},
+            ]
+            expenses, total_expenses = fetch_page(query)
+        total_pages = (total_expenses + per_page - 1) // per_page if total_expenses is not None else None
+
+        has_more = len(expenses) > per_page
+        expenses = expenses[:per_page]
+        if backward:
+            expenses.reverse()
+            has_prev, has_next = has_more, True
+        else:
+            has_prev, has_next = forward, has_more
+        if not has_prev:
+            page = 1
 
-        # Fetch expenses (paged)
-        expenses = db.expenses.find(query)\
-            .sort("date", -1)\
-            .skip((page - 1) * per_page)\
-            .limit(per_page)
+        # keyset bounds for the prev/next links
+        first, last = (expenses[0], expenses[-1]) if expenses else (None, None)
+        prev_args = {"before_date": first["date"].isoformat(), "before_id": str(first["_id"])} if has_prev and first else {}
+        next_args = {"after_date": last["date"].isoformat(), "after_id": str(last["_id"])} if has_next and last else {}
+        has_prev, has_next = bool(prev_args), bool(next_args)
 
         # pass back parsed query params so the template can prefill controls
-        import datetime as _dt
-        current_year = _dt.datetime.utcnow().year
+        current_year = _utcnow().year
         return render_template(
             "expenses.html",
             expenses=expenses,
@@ -268,6 +780,10 @@ def create_app():
             year=year_q,
             month=month_q,
             page=page,
+            has_prev=has_prev,
+            has_next=has_next,
+            prev_args=prev_args,
+            next_args=next_args,
             total_pages=total_pages,
             current_year=current_year
         )
@@ -285,30 +801,12 @@ def create_app():
         """
         Handle the form submission to create a new expense.
         """
-       
-            # Get form data
-        date_str = request.form.get("date")
-        amount = float(request.form.get("amount"))
-        category = request.form.get("category", "").strip()
-        note = request.form.get("note", "").strip()
-            
-        # Parse the date
-        from datetime import datetime
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            
-        # Create expense document
-        expense_doc = {
-                "date": date_obj,
-                "year": date_obj.year,
-                "month": date_obj.month,
-                "amount": amount,
-                "category": category,
-                "note": note,
-                "title": category  # You can customize this
-            }
-            
+        expense_doc = _expense_doc_from_form(request.form)
+
         # Insert into database
-        db.expenses.insert_one(expense_doc)
+        expenses_fast.insert_one(expense_doc)
+        _apply_expense_delta(expense_doc, 1)
+        _invalidate_summaries(expense_doc["month"], expense_doc["year"])
        
         return redirect(url_for("expenses_list"))
         """
@@ -322,58 +820,41 @@ def create_app():
 
     @app.route("/expense/edit/<expense_id>", methods=["GET", "POST"])
     def expense_edit(expense_id):
-        from bson.objectid import ObjectId
-        
+        oid = _safe_objectid(expense_id)
+        if not oid:
+            flash("Invalid expense id", "danger")
+            return redirect(url_for("expenses_list"))
+
         if request.method == "POST":
             # Handle update
-            from datetime import datetime
-            date_str = request.form.get("date")
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            
-            db.expenses.update_one(
-                {"_id": ObjectId(expense_id)},
-                {"$set": {
-                    "date": date_obj,
-                    "year": date_obj.year,
-                    "month": date_obj.month,
-                    "amount": float(request.form.get("amount")),
-                    "category": request.form.get("category", "").strip(),
-                    "note": request.form.get("note", "").strip(),
-                }}
-            )
+            new_doc = _expense_doc_from_form(request.form)
+
+            # the pre-image tells us which summary docs to take the old amount out of
+            old_doc = expenses_fast.find_one_and_update({"_id": oid}, {"$set": new_doc})
+            if old_doc:
+                _apply_expense_delta(old_doc, -1)
+                _apply_expense_delta(new_doc, 1)
+                _invalidate_summaries(old_doc["month"], old_doc["year"])
+                _invalidate_summaries(new_doc["month"], new_doc["year"])
             return redirect(url_for("expenses_list"))
     
          # GET: show edit form
-        expense = db.expenses.find_one({"_id": ObjectId(expense_id)})
+        expense = db.expenses.find_one({"_id": oid})
         return render_template("expense_edit.html", expense=expense)
-    @app.route("/expense/update/<expense_id>", methods=["POST"])
-    def expense_update(expense_id):
-        from bson.objectid import ObjectId
-        from datetime import datetime
-        
-        date_str = request.form.get("date")
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-        
-        db.expenses.update_one(
-            {"_id": ObjectId(expense_id)},
-            {"$set": {
-                "date": date_obj,
-                "year": date_obj.year,
-                "month": date_obj.month,
-                "amount": float(request.form.get("amount")),
-                "category": request.form.get("category", "").strip(),
-                "note": request.form.get("note", "").strip(),
-                "title": request.form.get("category", "").strip() or "Expense"
-            }}
-        )
-        return redirect(url_for("expenses_list"))
+
     @app.route("/expense/delete/<expense_id>",methods=["GET", "POST"])
     def expense_delete(expense_id):
         """
         Delete an expense and redirect to expenses list.
         """
-        from bson.objectid import ObjectId
-        db.expenses.delete_one({"_id": ObjectId(expense_id)})
+        oid = _safe_objectid(expense_id)
+        if not oid:
+            flash("Invalid expense id", "danger")
+            return redirect(url_for("expenses_list"))
+        old_doc = expenses_fast.find_one_and_delete({"_id": oid})
+        if old_doc:
+            _apply_expense_delta(old_doc, -1)
+            _invalidate_summaries(old_doc["month"], old_doc["year"])
         return redirect(url_for("expenses_list"))
 
 
@@ -385,8 +866,10 @@ def create_app():
         """
         GET: show form (if template exists)
         POST: create monthly budget. Required: budget (positive), month(1-12), year.
-        Behavior: If a budget for same month+year exists, we insert a new document (not upsert) to preserve history.
-        (If you prefer upsert/replace, it's easy to change.)
+        Behavior: one budget per month+year; submitting again for the same month updates it
+        in place with a single upsert (no find-then-insert race). The unique (year, month)
+        index enforces it; on data not yet migrated by init-db the newest budget is updated,
+        since that is the one every read path shows.
         """
         if request.method == "GET":
             # allow prefilling month/year via query params (e.g. ?month=3&year=2025)
@@ -412,15 +895,23 @@ def create_app():
 
         notes = request.form.get("notes", "").strip()
 
-        doc = {
-            "budget": budget_v,
-            "month": int(month),
-            "year": int(year),
-            "notes": notes,
-            "created_at": datetime.datetime.utcnow(),
-        }
-        db.monthly_budgets.insert_one(doc)
-        flash("Monthly budget added", "success")
+        now = _utcnow()
+        previous = budgets_durable.find_one_and_update(
+            {"month": int(month), "year": int(year)},
+            {
+                "$set": {"budget": budget_v, "notes": notes, "modified_at": now},
+                "$setOnInsert": {"month": int(month), "year": int(year), "created_at": now},
+            },
+            projection={"_id": 1},
+            sort=[("created_at", -1)],
+            upsert=True,
+        )
+        _invalidate_summaries(int(month), int(year))
+        _invalidate_json("budgets")
+        if previous is None:
+            flash("Monthly budget added", "success")
+        else:
+            flash("Monthly budget updated", "success")
         return redirect(url_for("home"))
 
 
@@ -456,14 +947,29 @@ def create_app():
         year = _parse_int_or_none(request.form.get("year")) or existing.get("year")
         notes = request.form.get("notes", existing.get("notes", "")).strip()
 
+        # moving a budget onto a month that already has one would break one-per-month
+        clash = db.monthly_budgets.find_one(
+            {"month": int(month), "year": int(year), "_id": {"$ne": oid}}, {"_id": 1}
+        )
+        if clash:
+            flash(f"A budget for {int(month)}/{int(year)} already exists; edit that one instead", "danger")
+            return redirect(url_for("edit_monthly_budget", budget_id=budget_id))
+
         update = {
             "budget": budget_v,
             "month": int(month),
             "year": int(year),
             "notes": notes,
-            "modified_at": datetime.datetime.utcnow(),
+            "modified_at": _utcnow(),
         }
-        db.monthly_budgets.update_one({"_id": oid}, {"$set": update})
+        try:
+            budgets_durable.update_one({"_id": oid}, {"$set": update})
+        except DuplicateKeyError:
+            # another request created that month's budget after the check above
+            flash(f"A budget for {int(month)}/{int(year)} already exists; edit that one instead", "danger")
+            return redirect(url_for("edit_monthly_budget", budget_id=budget_id))
+        _invalidate_summaries()
+        _invalidate_json("budgets")
         flash("Monthly budget updated", "success")
         return redirect(url_for("home"))
 
@@ -478,38 +984,47 @@ def create_app():
             flash("Invalid budget id", "danger")
             return redirect(url_for("home"))
         db.monthly_budgets.delete_one({"_id": oid})
+        _invalidate_summaries()
+        _invalidate_json("budgets")
         flash("Budget deleted", "info")
         return redirect(url_for("home"))
 
-    @app.route("/monthly_budget/get/<int:month>/<int:year>")
-    def get_monthly_budget(month, year):
+    @cache.memoize(timeout=SUMMARY_CACHE_TIMEOUT)
+    def _monthly_budget_data(month, year):
         """
-        Return JSON: details of the monthly budget (latest one found) + computed spent & remaining.
-        If multiple budgets exist for same month/year, returns the latest by created_at.
+        Latest budget for month/year with its spent/remaining, or None if there is no budget.
         """
-        doc = db.monthly_budgets.find({"month": month, "year": year}).sort("created_at", -1).limit(1)
-        doc = list(doc)
-        if not doc:
-            return jsonify({"found": False}), 404
-        mb = doc[0]
-
-        # compute spent amount over plans in that month/year (sum actual_expense)
-        agg = list(db.plans.aggregate([
+        # one round trip: latest budget for the month joined with the plans' spent total;
+        # at most one doc comes back, so take it straight off the cursor
+        mb = next(db.monthly_budgets.aggregate([
             {"$match": {"month": month, "year": year}},
-            {"$group": {"_id": None, "spent": {"$sum": "$actual_expense"}}}
-        ]))
-        spent_amount = float(agg[0]["spent"]) if agg and agg[0].get("spent") is not None else 0.0
-        remaining = float(mb["budget"]) - spent_amount
-
-        out = {
+            {"$sort": {"created_at": -1}},
+            {"$limit": 1},
+            _spent_lookup("plans", PLANS_SPENT_GROUP, month, year),
+            {"$addFields": {"spent": {"$ifNull": [{"$arrayElemAt": ["$agg.spent", 0]}, 0]}}},
+            {"$addFields": {"remaining": {"$subtract": ["$budget", "$spent"]}}},
+        ], maxTimeMS=QUERY_MAX_TIME_MS), None)
+        if mb is None:
+            return None
+        return {
             "budget_id": str(mb["_id"]),
             "budget": mb["budget"],
             "month": mb["month"],
             "year": mb["year"],
             "notes": mb.get("notes", ""),
-            "spent": spent_amount,
-            "remaining": remaining
+            "spent": float(mb["spent"]),
+            "remaining": float(mb["remaining"])
         }
+
+    @app.route("/monthly_budget/get/<int:month>/<int:year>")
+    def get_monthly_budget(month, year):
+        """
+        Return JSON: details of the monthly budget (latest one found) + computed spent & remaining.
+        If multiple budgets exist for same month/year, returns the latest by created_at.
+        """
+        out = _monthly_budget_data(month, year)
+        if out is None:
+            return jsonify({"found": False}), 404
         return jsonify(out)
 
 
@@ -530,6 +1045,10 @@ def create_app():
             # delete all monthly budgets and expenses
             db.monthly_budgets.delete_many({})
             db.expenses.delete_many({})
+            db.monthly_summary.delete_many({})
+            db.monthly_category_summary.delete_many({})
+            _invalidate_summaries()
+            _invalidate_json("budgets")
             flash('All monthly budgets and expenses have been cleared.', 'success')
         except Exception as e:
             flash(f'Failed to clear history: {str(e)}', 'danger')
@@ -542,6 +1061,7 @@ def create_app():
     # Finder endpoints (return JSON arrays)
     # -----------------------
     @app.route("/plans/find_by_date", methods=["GET"])
+    @_cached_json("plans")
     def find_by_date():
         """
         Query params supported:
@@ -567,14 +1087,11 @@ def create_app():
         if year is not None:
             q["year"] = int(year)
 
-        cursor = db.plans.find(q).sort("created_at", -1)
-        out = []
-        for p in cursor:
-            p["_id"] = str(p["_id"])
-            out.append(p)
-        return jsonify(out)
+        cursor = db.plans.find(q, PLAN_LIST_PROJ).sort("created_at", -1)
+        return _jsonify_docs(cursor)
     
     @app.route("/plans/find_by_month_year", methods=["GET"])
+    @_cached_json("plans")
     def find_by_month_year():
         """
         /plans/find_by_month_year?month=3&year=2025
@@ -583,14 +1100,11 @@ def create_app():
         year = _parse_int_or_none(request.args.get("year"))
         if month is None or year is None:
             return jsonify({"error": "month and year are required"}), 400
-        cursor = db.plans.find({"month": int(month), "year": int(year)}).sort("created_at", -1)
-        out = []
-        for p in cursor:
-            p["_id"] = str(p["_id"])
-            out.append(p)
-        return jsonify(out)
+        cursor = db.plans.find({"month": int(month), "year": int(year)}, PLAN_LIST_PROJ).sort("created_at", -1)
+        return _jsonify_docs(cursor)
     
     @app.route("/plans/find_by_year", methods=["GET"])
+    @_cached_json("plans")
     def find_by_year():
         """
         /plans/find_by_year?year=2025
@@ -598,124 +1112,177 @@ def create_app():
         year = _parse_int_or_none(request.args.get("year"))
         if year is None:
             return jsonify({"error": "year is required"}), 400
-        cursor = db.plans.find({"year": int(year)}).sort("created_at", -1)
-        out = []
-        for p in cursor:
-            p["_id"] = str(p["_id"])
-            out.append(p)
-        return jsonify(out)
+        cursor = db.plans.find({"year": int(year)}, PLAN_LIST_PROJ).sort("created_at", -1)
+        return _jsonify_docs(cursor)
     
     @app.route("/plans/find_by_category", methods=["GET"])
+    @_cached_json("plans")
     def find_by_category():
         """
         /plans/find_by_category?category=food
-        Case-insensitive partial matching.
+        Case-insensitive prefix matching (against the lowercased category_lc copy).
         """
         category = request.args.get("category", "").strip()
         if not category:
             return jsonify({"error": "category query param required"}), 400
-        cursor = db.plans.find({"category": {"$regex": category, "$options": "i"}}).sort("created_at", -1)
-        out = []
-        for p in cursor:
-            p["_id"] = str(p["_id"])
-            out.append(p)
-        return jsonify(out)
+        cursor = db.plans.find({"category_lc": _category_prefix(category)}, PLAN_LIST_PROJ).sort("created_at", -1)
+        return _jsonify_docs(cursor)
 
     
     # -----------------------
     # Budget summary
     # -----------------------
-    @app.route("/budget/summary/<int:month>/<int:year>")
-    def budget_summary(month, year):
+    @cache.memoize(timeout=SUMMARY_CACHE_TIMEOUT)
+    def _budget_summary_data(month, year):
         """
-        Returns JSON: {month, year, spent, budget(optional if exists), 
-                      remaining_budget(optional if budget exists), 
-                      unallocated_budget(optional if budget exists)}
-        If a monthly_budget exists for the month/year, include budget and calculations. 
-        Otherwise budget/remaining_budget/unallocated_budget = null.
+        Spent vs budget for month/year as a dict (see budget_summary).
         """
-        # Calculate total spent for month/year from EXPENSES collection
-        agg = list(db.expenses.aggregate([
+        # Latest monthly budget joined with the month's materialized spent total
+        # (monthly_summary) in one round trip; both sides are index lookups
+        mb_doc = next(db.monthly_budgets.aggregate([
             {"$match": {"month": month, "year": year}},
-            {"$group": {
-                "_id": None, 
-                "spent": {"$sum": "$amount"},  #  amount
-            }}
-        ]))
-        
-        spent_amount = float(agg[0]["spent"]) if agg and agg[0].get("spent") is not None else 0.0
+            {"$sort": {"created_at": -1}},
+            {"$limit": 1},
+            _spent_lookup("monthly_summary", SUMMARY_SPENT_PROJECT, month, year),
+            {"$project": {"budget": 1, "spent": {"$arrayElemAt": ["$agg.spent", 0]}}},
+        ], maxTimeMS=QUERY_MAX_TIME_MS), None)
 
-        # Get monthly budget
-        mb_doc = db.monthly_budgets.find_one({"month": month, "year": year})
-        
         if mb_doc:
+            spent_amount = float(mb_doc.get("spent") or 0.0)
             budget_value = float(mb_doc["budget"])
             remaining_budget = budget_value - spent_amount
         else:
+            # no budget for the month: still report what was spent
+            summary = db.monthly_summary.find_one(
+                {"year": year, "month": month}, {"_id": 0, "spent": 1}, max_time_ms=QUERY_MAX_TIME_MS
+            )
+            spent_amount = float(summary["spent"]) if summary else 0.0
             budget_value = None
             remaining_budget = None
 
-        return jsonify({
+        return {
             "month": month,
             "year": year,
             "spent": spent_amount,
             "budget": budget_value,
             "remaining_budget": remaining_budget,
-        })
+        }
+
+    @app.route("/budget/summary/<int:month>/<int:year>")
+    def budget_summary(month, year):
+        """
+        Returns JSON: {month, year, spent, budget(optional if exists), 
+                      remaining_budget(optional if budget exists), 
+                      unallocated_budget(optional if budget exists)}
+        If a monthly_budget exists for the month/year, include budget and calculations. 
+        Otherwise budget/remaining_budget/unallocated_budget = null.
+        """
+        return jsonify(_budget_summary_data(month, year))
+
+    @app.route("/budget/summary/year/<int:year>")
+    def budget_summary_year(year):
+        """
+        Returns JSON: {year, months: [{month, spent, budget, remaining_budget}, ...]} for months 1-12,
+        with the same semantics as /budget/summary/<month>/<year> (spent from EXPENSES, latest budget).
+        Two queries for the whole year instead of twelve summary calls.
+        """
+        spent_by_month = {
+            it["month"]: float(it["spent"])
+            for it in db.monthly_summary.find({"year": year}, {"_id": 0, "month": 1, "spent": 1})
+                .max_time_ms(QUERY_MAX_TIME_MS)
+        }
+
+        # ascending created_at so the latest budget for a month wins
+        budget_by_month = {}
+        for b in db.monthly_budgets.find({"year": year}, {"_id": 0, "month": 1, "budget": 1})\
+                .sort("created_at", 1)\
+                .max_time_ms(QUERY_MAX_TIME_MS):
+            budget_by_month[b["month"]] = float(b["budget"])
+
+        months = []
+        for m in range(1, 13):
+            spent_amount = spent_by_month.get(m, 0.0)
+            budget_value = budget_by_month.get(m)
+            months.append({
+                "month": m,
+                "spent": spent_amount,
+                "budget": budget_value,
+                "remaining_budget": budget_value - spent_amount if budget_value is not None else None,
+            })
+
+        return jsonify({"year": year, "months": months})
 
     # -----------------------
     # Additional APIs to list all plans
     # -----------------------
     @app.route("/api/plans", methods=["GET"])
+    @_cached_json("plans")
     def api_get_plans():
-        cursor = db.plans.find({}).sort("created_at", -1)
-        out = []
-        for p in cursor:
-            p["_id"] = str(p["_id"])
-            out.append(p)
-        return jsonify(out)
+        """
+        /api/plans?page=2&size=50
+        /api/plans?before=2025-03-01T12:00:00&size=50
+        `before` (an ISO created_at from the previous page) pages by keyset on the
+        created_at index instead of skipping, so deep pages cost the same as the first.
+        """
+        page, size = _page_args()
+        before = request.args.get("before", "").strip()
+        if before:
+            try:
+                before_dt = datetime.datetime.fromisoformat(before)
+            except ValueError:
+                return jsonify({"error": "before must be an ISO datetime"}), 400
+            cursor = db.plans.find({"created_at": {"$lt": before_dt}}, PLAN_LIST_PROJ).sort("created_at", -1)
+        else:
+            cursor = db.plans.find({}, PLAN_LIST_PROJ).sort("created_at", -1).skip((page - 1) * size)
+        return _jsonify_docs(cursor.limit(size), batch_size=size)
 
     @app.route("/api/budgets", methods=["GET"])
+    @_cached_json("budgets")
     def api_get_budgets():
-        cursor = db.monthly_budgets.find({}).sort([("year", -1), ("month", -1)])
-        out = []
-        for b in cursor:
-            b["_id"] = str(b["_id"])
-            out.append(b)
-        return jsonify(out)
+        """
+        /api/budgets?page=1&size=50
+        """
+        page, size = _page_args()
+        cursor = db.monthly_budgets.find({}, BUDGET_LIST_PROJ).sort([("year", -1), ("month", -1)])\
+            .skip((page - 1) * size)\
+            .limit(size)
+        return _jsonify_docs(cursor, batch_size=size)
 
 
-    @app.route("/budget/category-breakdown/<int:month>/<int:year>")
-    def category_breakdown(month, year):
+    @cache.memoize(timeout=SUMMARY_CACHE_TIMEOUT)
+    def _category_breakdown_data(month, year):
         """
-        Returns JSON: {month, year, categories: [{category, spent, count}]}
-        Groups by unique categories that users actually used that month
+        Per-category spent/count for month/year as a dict (see category_breakdown).
         """
-        # Aggregate to get spent amounts by category from EXPENSES
-        agg = list(db.expenses.aggregate([
-            {"$match": {"month": month, "year": year}},
-            {"$group": {
-                "_id": {"$toLower": "$category"},  # toLower
-                "spent": {"$sum": "$amount"},
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"spent": -1}}
-        ]))
+        # Read the materialized per-category totals (kept by _apply_expense_delta);
+        # count 0 docs are categories whose expenses were all edited away or deleted
+        agg = db.monthly_category_summary.find(
+            {"year": year, "month": month, "count": {"$gt": 0}},
+            {"_id": 0, "category": 1, "spent": 1, "count": 1},
+        ).sort("spent", -1).max_time_ms(QUERY_MAX_TIME_MS)
         
         # Format the results
         categories = []
         for item in agg:
             categories.append({
-                "category": item["_id"].title(),  # capitalize for display
+                "category": item["category"].title(),  # capitalize for display
                 "spent": float(item["spent"]),
                 "count": item["count"]
             })
         
-        return jsonify({
+        return {
             "month": month,
             "year": year,
             "categories": categories
-        })
+        }
+
+    @app.route("/budget/category-breakdown/<int:month>/<int:year>")
+    def category_breakdown(month, year):
+        """
+        Returns JSON: {month, year, categories: [{category, spent, count}]}
+        Groups by unique categories that users actually used that month
+        """
+        return jsonify(_category_breakdown_data(month, year))
 
 
     @app.route("/budget/daily_totals/<int:month>/<int:year>")
@@ -729,25 +1296,18 @@ def create_app():
         start = datetime.datetime(year, month, 1)
         end = start + datetime.timedelta(days=30)
 
-        # aggregate totals by year/month/day within the window
-        agg = list(db.expenses.aggregate([
+        # aggregate totals per day within the window; $dateTrunc (MongoDB 5.0+) keys each
+        # bucket by a single date instead of three date-part fields to reassemble
+        agg = db.expenses.aggregate([
             {"$match": {"date": {"$gte": start, "$lt": end}}},
             {"$group": {
-                "_id": {"y": {"$year": "$date"}, "m": {"$month": "$date"}, "d": {"$dayOfMonth": "$date"}},
+                "_id": {"$dateTrunc": {"date": "$date", "unit": "day"}},
                 "total": {"$sum": "$amount"}
             }},
-            {"$project": {"_id": 0, "year": "$_id.y", "month": "$_id.m", "day": "$_id.d", "total": 1}},
-            {"$sort": {"year": 1, "month": 1, "day": 1}}
-        ]))
+        ], maxTimeMS=QUERY_MAX_TIME_MS)
 
-        # map results by date
-        totals = {}
-        for it in agg:
-            try:
-                d = datetime.date(int(it["year"]), int(it["month"]), int(it["day"]))
-                totals[d] = float(it.get("total", 0.0))
-            except Exception:
-                continue
+        # map results by date (the days list below puts them in order)
+        totals = {it["_id"].date(): float(it["total"]) for it in agg}
 
         days = []
         for i in range(30):
@@ -765,6 +1325,16 @@ def create_app():
         return render_template('settings.html')
 
 
+    # -----------------------
+    # Templates
+    # -----------------------
+    # Outside development, never stat template files for changes, and compile every
+    # template now so no request (or forked worker, with --preload) pays the first-render cost.
+    if os.getenv("FLASK_ENV") != "development":
+        app.jinja_env.auto_reload = False
+    for name in app.jinja_env.list_templates(extensions=["html"]):
+        app.jinja_env.get_template(name)
+
     return app
 
 app = create_app()